@@ -10,83 +10,100 @@
 ##########################################################################
 
 import argparse
+import importlib
 import os
 
 
 def load_providers():
-    """ Loads all the providers """
+    """ Finds all the providers, without importing them """
     providers = {}
 
-    for filename in os.listdir('providers'):
-        filename = 'providers/' + filename
+    with os.scandir('providers') as entries:
+        for entry in entries:
+            if entry.is_file():
+                base, extension = os.path.splitext(entry.name)
 
-        if os.path.isfile(filename):
-            basename = os.path.basename(filename)
-            base, extension = os.path.splitext(basename)
-
-            if extension == ".py" and not basename.startswith("_"):
-                module = __import__("providers." + basename[:-3],
-                                    fromlist=["providers"])
-                provider = module.load()
-                providers[basename[:-3]] = provider
+                if extension == ".py" and not entry.name.startswith("_"):
+                    providers[base] = "providers." + base
 
     return providers
 
 
+def load_provider(providers, name):
+    """ Imports and loads a single provider """
+    module = importlib.import_module(providers[name])
+
+    return module.load()
+
+
+def add_debug_arg(parser):
+    """ Adds the --debug argument to a parser """
+    parser.add_argument('--debug', action='store_true',
+                        help='send debug messages to stderr')
+
+
 def get_args(providers):
-    """ Creates the parsers and returns the args """
+    """ Creates the parsers and returns the args, and the selected provider """
+    # Figure out which provider has been requested using a minimal parser,
+    # so we only need to import and build the parsers for that one
+    pre_parser = argparse.ArgumentParser(add_help=False)
+    add_debug_arg(pre_parser)
+    pre_parser.add_argument('provider', nargs='?')
+
+    pre_args, _ = pre_parser.parse_known_args()
+
     # Create the top-level parser
     parser = argparse.ArgumentParser(prog='pgacloud.py')
-    parser.add_argument('--debug', action=argparse.BooleanOptionalAction,
-                        default=False, help='send debug messages to stderr')
+    add_debug_arg(parser)
 
     # Create the provider sub-parser
     parsers = parser.add_subparsers(help='provider help', dest='provider')
 
-    # Load the provider parsers
-    for provider in providers:
-        providers[provider].init_args(parsers)
+    # Load the parser for the requested provider. The others just get
+    # placeholders, so they're still listed in the top-level help and errors
+    # without having to import them
+    provider = None
+    if pre_args.provider in providers:
+        provider = load_provider(providers, pre_args.provider)
+
+    for name in sorted(providers):
+        if provider is not None and name == pre_args.provider:
+            provider.init_args(parsers)
+        else:
+            parsers.add_parser(name)
 
     args = parser.parse_args()
 
-    return parser, args
+    return parser, args, provider
 
 
-def execute_command(providers, parser, args):
+def execute_command(provider, parser, args):
     """ Executes the command in the provider """
 
-    # Switch - for _ in command names. We use - in the CLI syntax for ease of
-    # use, but we need an _ in Python function names
-    if 'command' in args and args.command is not None:
-        args.command = args.command.replace('-', '_')
-
-    # Figure out what provider the command was for (if any) and call the
-    # relevant function. If we don't get a match, print the help
-    if args.provider in providers and \
-            'command' in args and \
-            args.command is not None:
-        command = providers[args.provider].commands()[args.command]
-        command(args)
+    # The command parsers record the function to call for the command. If
+    # we don't have one, print the help
+    if 'func' in args:
+        args.func(args)
     else:
         # If no provider has been given, display the top level help,
         # otherwise, call the help() method in the provider
-        if args.provider is None:
+        if provider is None:
             parser.print_help()
         else:
-            command = providers[args.provider].commands()['help']
+            command = provider.commands()['help']
             command()
 
 
 def main():
     """ Entry point """
-    # Load the providers
+    # Find the providers
     providers = load_providers()
 
-    # Get the args
-    parser, args = get_args(providers)
+    # Get the args, loading only the requested provider
+    parser, args, provider = get_args(providers)
 
     # Execute the command
-    execute_command(providers, parser, args)
+    execute_command(provider, parser, args)
 
 
 if __name__ == '__main__':
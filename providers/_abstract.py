@@ -7,24 +7,63 @@
 #
 ##########################################################################
 
+def command(func):
+    """ Decorator to register a provider method as a command """
+    # The command name is derived from the function name, so it must have
+    # the cmd_ prefix
+    if not func.__name__.startswith('cmd_'):
+        raise TypeError('command function names must start with cmd_, '
+                        'not {}'.format(func.__name__))
+
+    func.is_command = True
+
+    return func
+
+
 class AbsProvider:
     """ Abstract provider """
     parser = None
+    _commands = None
+    _command_attrs = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """ Find the commands implemented by the provider class. """
+        super().__init_subclass__(**kwargs)
+
+        # Commands are keyed by their CLI name. We use - in the CLI syntax for
+        # ease of use, but we need an _ in Python function names. Walk the
+        # class dicts from the base down, so subclasses can override commands
+        cls._command_attrs = {
+            attr[4:].replace('_', '-'): attr
+            for klass in reversed(cls.__mro__)
+            for attr, value in vars(klass).items()
+            if getattr(value, 'is_command', False)
+        }
 
     def init_args(self, parsers):
         pass
 
+    def add_command_parser(self, parsers, name, **kwargs):
+        """ Add the parser for a command, dispatching to its function """
+        commands = self.commands()
+        if name not in commands:
+            raise ValueError('{} has no @command function for {}'.format(
+                type(self).__name__, name))
+
+        parser = parsers.add_parser(name, **kwargs)
+        parser.set_defaults(func=commands[name])
+
+        return parser
+
     def commands(self):
         """ Get the list of commands for the current provider. """
-        attrs = filter(lambda attr: attr.startswith('cmd_'), dir(self))
-        commands = {}
-
-        for attr in attrs:
-            method = getattr(self, attr)
-            commands[attr[4:]] = method
+        if self._commands is None:
+            self._commands = {name: getattr(self, attr)
+                              for name, attr in self._command_attrs.items()}
 
-        return commands
+        return self._commands
 
+    @command
     def cmd_help(self):
         """ Prints the provider level help """
         self.parser.print_help()
@@ -9,17 +9,11 @@
 
 # Microsoft Azure PostgreSQL provider
 
+import concurrent.futures
 import os
 import sys
 
-from azure.core.exceptions import ResourceNotFoundError
-from azure.identity import AzureCliCredential
-from azure.mgmt.rdbms.postgresql import PostgreSQLManagementClient
-from azure.mgmt.rdbms.postgresql.models import ServerForCreate, \
-    ServerPropertiesForDefaultCreate, Sku, StorageProfile
-from azure.mgmt.resource import ResourceManagementClient
-
-from providers._abstract import AbsProvider
+from providers._abstract import AbsProvider, command
 from utils.io import output, debug, error
 from utils.misc import get_my_ip, get_random_id
 
@@ -58,9 +52,8 @@ class AzureProvider(AbsProvider):
                                              dest='command')
 
         # Create the create instance command parser
-        parser_create_instance = parsers.add_parser('create-instance',
-                                                    help='create a new '
-                                                         'instance')
+        parser_create_instance = self.add_command_parser(
+            parsers, 'create-instance', help='create a new instance')
 
         parser_create_instance.add_argument('--name', required=True,
                                             help='name of the instance')
@@ -87,8 +80,8 @@ class AzureProvider(AbsProvider):
                                             help='storage size in GB')
 
         # Create the delete instance command parser
-        parser_delete_instance = parsers.add_parser('delete-instance',
-                                                    help='delete an instance')
+        parser_delete_instance = self.add_command_parser(
+            parsers, 'delete-instance', help='delete an instance')
         parser_delete_instance.add_argument('--name', required=True,
                                             help='name of the instance')
 
@@ -98,6 +91,14 @@ class AzureProvider(AbsProvider):
 
     def _get_azure_client(self, type):
         """ Create/cache/return an Azure client object """
+        if type in self._clients:
+            return self._clients[type]
+
+        # The Azure SDK is slow to import, so only do so when it's needed
+        from azure.identity import AzureCliCredential
+        from azure.mgmt.rdbms.postgresql import PostgreSQLManagementClient
+        from azure.mgmt.resource import ResourceManagementClient
+
         # Acquire a credential object using CLI-based authentication.
         if self._credentials is None:
             self._credentials = AzureCliCredential()
@@ -111,9 +112,6 @@ class AzureProvider(AbsProvider):
                       'set')
                 sys.exit(1)
 
-        if type in self._clients:
-            return self._clients[type]
-
         if type == 'postgresql':
             client = PostgreSQLManagementClient(self._credentials,
                                                 self._subscription_id)
@@ -121,9 +119,9 @@ class AzureProvider(AbsProvider):
             client = ResourceManagementClient(self._credentials,
                                               self._subscription_id)
 
-        self._clients['type'] = client
+        self._clients[type] = client
 
-        return self._clients['type']
+        return client
 
     def _create_resource_group(self, args):
         """ Create the Resource Group if it doesn't exist """
@@ -136,10 +134,14 @@ class AzureProvider(AbsProvider):
             args.resource_group,
             {"location": args.region})
 
-        return result.__dict__
+        return {'name': result.name}
 
     def _create_azure_instance(self, args):
         """ Create an Azure instance """
+        from azure.core.exceptions import ResourceNotFoundError
+        from azure.mgmt.rdbms.postgresql.models import ServerForCreate, \
+            ServerPropertiesForDefaultCreate, Sku, StorageProfile
+
         # Obtain the management client object
         postgresql_client = self._get_azure_client('postgresql')
 
@@ -180,16 +182,18 @@ class AzureProvider(AbsProvider):
 
         server = poller.result()
 
-        return server.__dict__
+        return {
+            'id': server.id,
+            'location': server.location,
+            'fully_qualified_domain_name': server.fully_qualified_domain_name,
+            'administrator_login': server.administrator_login
+        }
 
-    def _create_firewall_rule(self, args):
+    def _create_firewall_rule(self, args, ip):
         """ Create a firewall rule on an instance """
         postgresql_client = self._get_azure_client('postgresql')
-        ip = get_my_ip()
 
-        name = 'pgacloud_{}_{}_{}'.format(args.name,
-                                          ip.replace('.', '-'),
-                                          get_random_id())
+        name = f'pgacloud_{args.name}_{ip.replace(".", "-")}_{get_random_id()}'
 
         # Provision the rule and wait for completion
         debug(args, 'Adding ingress rule for: {}/32...'.format(ip))
@@ -201,7 +205,7 @@ class AzureProvider(AbsProvider):
 
         firewall_rule = poller.result()
 
-        return firewall_rule.__dict__
+        return {'id': firewall_rule.id}
 
     def _delete_azure_instance(self, args, name):
         """ Delete an Azure instance """
@@ -224,11 +228,18 @@ class AzureProvider(AbsProvider):
     ##########################################################################
     # User commands
     ##########################################################################
+    @command
     def cmd_create_instance(self, args):
         """ Deploy an Azure instance and firewall rule """
-        rg = self._create_resource_group(args)
-        instance = self._create_azure_instance(args)
-        fw = self._create_firewall_rule(args)
+        # The firewall rule can only be created once the instance exists, but
+        # we can look up our public IP address in the background while the
+        # resource group and instance are being deployed
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            ip = executor.submit(get_my_ip)
+
+            rg = self._create_resource_group(args)
+            instance = self._create_azure_instance(args)
+            fw = self._create_firewall_rule(args, ip.result())
 
         data = {
             'Id': instance['id'],
@@ -243,6 +254,7 @@ class AzureProvider(AbsProvider):
 
         output(data)
 
+    @command
     def cmd_delete_instance(self, args):
         """ Delete an Azure instance """
         self._delete_azure_instance(args, args.name)
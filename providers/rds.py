@@ -13,9 +13,7 @@ import configparser
 import os
 import time
 
-import boto3
-
-from providers._abstract import AbsProvider
+from providers._abstract import AbsProvider, command
 from utils.io import debug, error, output
 from utils.misc import get_my_ip, get_random_id
 
@@ -23,28 +21,19 @@ from utils.misc import get_my_ip, get_random_id
 class RdsProvider(AbsProvider):
     def __init__(self):
         self._clients = {}
+        self._session = None
 
-        # Get the credentials; environment takes precedence over config
-        # TODO: Use the correct path on Windows
-        credentials = configparser.ConfigParser()
-        credentials.read('~/.aws/credentials')
-
-        self._access_key = credentials.get('default', 'aws_access_key_id',
-                                           fallback='')
-        self._secret_key = credentials.get('default', 'aws_secret_access_key',
-                                           fallback='')
-
-        if 'AWS_ACCESS_KEY_ID' in os.environ:
-            self._access_key = os.environ['AWS_ACCESS_KEY_ID']
-
-        if 'AWS_SECRET_ACCESS_KEY' in os.environ:
-            self._secret_key = os.environ['AWS_SECRET_ACCESS_KEY']
+        # Credentials are left to boto3, which reads them from the
+        # environment and the AWS CLI files itself. We only need the default
+        # region for the parser, so read that from the CLI config file
+        profile = os.environ.get('AWS_PROFILE', 'default')
+        section = profile if profile == 'default' else 'profile ' + profile
 
-        # Get the default region
         config = configparser.ConfigParser()
-        config.read('~/.aws/config')
+        config.read(os.path.expanduser(
+            os.environ.get('AWS_CONFIG_FILE', '~/.aws/config')))
 
-        self._default_region = config.get('default', 'region',
+        self._default_region = config.get(section, 'region',
                                           fallback='us-east-1')
 
     def init_args(self, parsers):
@@ -70,9 +59,8 @@ class RdsProvider(AbsProvider):
                                              dest='command')
 
         # Create the create instance command parser
-        parser_create_instance = parsers.add_parser('create-instance',
-                                                    help='create a new '
-                                                         'instance')
+        parser_create_instance = self.add_command_parser(
+            parsers, 'create-instance', help='create a new instance')
         parser_create_instance.add_argument('--name', required=True,
                                             help='name of the instance')
         parser_create_instance.add_argument('--db-name', default='postgres',
@@ -105,8 +93,8 @@ class RdsProvider(AbsProvider):
                                                  'database (default: gp2)')
 
         # Create the delete instance command parser
-        parser_delete_instance = parsers.add_parser('delete-instance',
-                                                    help='delete an instance')
+        parser_delete_instance = self.add_command_parser(
+            parsers, 'delete-instance', help='delete an instance')
         parser_delete_instance.add_argument('--name', required=True,
                                             help='name of the instance')
         parser_delete_instance.add_argument('--security-group',
@@ -121,14 +109,23 @@ class RdsProvider(AbsProvider):
         if type in self._clients:
             return self._clients[type]
 
-        session = boto3.Session(
-            aws_access_key_id=self._access_key,
-            aws_secret_access_key=self._secret_key,
-        )
+        # boto3 is slow to import, so only do so when it's needed
+        import boto3
+        from botocore.config import Config
 
-        self._clients['type'] = session.client(type, region_name=args.region)
+        if self._session is None:
+            self._session = boto3.Session()
 
-        return self._clients['type']
+        # Retry throttled requests with client side rate limiting, and fail
+        # fast if we can't connect rather than hanging the caller
+        config = Config(connect_timeout=5,
+                        retries={'mode': 'adaptive', 'max_attempts': 10})
+
+        client = self._session.client(type, region_name=args.region,
+                                      config=config)
+        self._clients[type] = client
+
+        return client
 
     def _create_security_group(self, args):
         """ Create a new security group for the instance """
@@ -180,7 +177,6 @@ class RdsProvider(AbsProvider):
 
     def _create_rds_instance(self, args, security_group):
         """ Create an RDS instance """
-        ec2 = self._get_aws_client('ec2', args)
         rds = self._get_aws_client('rds', args)
 
         try:
@@ -203,36 +199,23 @@ class RdsProvider(AbsProvider):
                                    ])
 
         except rds.exceptions.DBInstanceAlreadyExistsFault as e:
-            try:
-                debug(args, 'Deleting security group: {}...'.
-                      format(security_group))
-                ec2.delete_security_group(GroupId=security_group)
-            except:
-                pass
+            self._discard_security_group(args, security_group)
             error(args, 'RDS instance {} already exists.'.format(args.name))
         except Exception as e:
-            try:
-                debug(args, 'Deleting security group: {}...'.
-                      format(security_group))
-                ec2.delete_security_group(GroupId=security_group)
-            except:
-                pass
+            self._discard_security_group(args, security_group)
             error(args, e)
 
-        # Wait for completion
-        running = True
-        while running:
+        # Wait for completion. The waiter polls until the instance is
+        # available, and fails if it ends up in a state it can't recover from
+        try:
+            waiter = rds.get_waiter('db_instance_available')
+            waiter.wait(DBInstanceIdentifier=args.name,
+                        WaiterConfig={'Delay': 5, 'MaxAttempts': 720})
+
             response = rds.describe_db_instances(
                 DBInstanceIdentifier=args.name)
-
-            db_instance = response['DBInstances'][0]
-            status = db_instance['DBInstanceStatus']
-
-            if status != 'creating' and status != 'backing-up':
-                running = False
-
-            if running:
-                time.sleep(5)
+        except Exception as e:
+            error(args, e)
 
         return response['DBInstances']
 
@@ -273,9 +256,22 @@ class RdsProvider(AbsProvider):
         except Exception as e:
             error(args, e)
 
+    def _discard_security_group(self, args, id):
+        """ Delete a security group, ignoring any errors """
+        ec2 = self._get_aws_client('ec2', args)
+
+        debug(args, 'Deleting security group: {}...'.format(id))
+        try:
+            ec2.delete_security_group(
+                GroupId=id
+            )
+        except:
+            pass
+
     ##########################################################################
     # User commands
     ##########################################################################
+    @command
     def cmd_create_instance(self, args):
         """ Create an RDS instance and security group """
         security_group = self._create_security_group(args)
@@ -293,6 +289,7 @@ class RdsProvider(AbsProvider):
 
         output(data)
 
+    @command
     def cmd_delete_instance(self, args):
         """ Delete an RDS instance and (optionally) a security group """
         self._delete_rds_instance(args, args.name)
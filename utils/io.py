@@ -7,9 +7,9 @@
 #
 ##########################################################################
 
-import datetime
 import json
 import sys
+import time
 
 
 def debug(args, message):
@@ -17,10 +17,7 @@ def debug(args, message):
     if not args.debug:
         return
 
-    now = datetime.datetime.now()
-
-    print('[{}]: {}'.format(now.strftime("%H:%M:%S"), message),
-          file=sys.stderr)
+    print(f'[{time.strftime("%H:%M:%S")}]: {message}', file=sys.stderr)
 
 
 def error(args, message):
@@ -33,5 +30,8 @@ def error(args, message):
 
 
 def output(data):
-    """ Dump JSON output from a dict """
-    print(json.dumps(data, indent=4, default=str))
\ No newline at end of file
+    """ Dump JSON output from a dict, pretty printed only for humans """
+    indent = 4 if sys.stdout.isatty() else None
+
+    json.dump(data, sys.stdout, indent=indent, default=str)
+    sys.stdout.write('\n')
\ No newline at end of file
@@ -7,27 +7,29 @@
 #
 ##########################################################################
 
+import functools
 import random
 import string
 import urllib.request
 
+_ID_CHARS = string.ascii_letters + string.digits
 
+# Services that return our public IP address, in order of preference
+_IP_URLS = ('https://ident.me', 'https://ifconfig.me/ip')
+
+
+@functools.lru_cache(maxsize=1)
 def get_my_ip():
-    """ Return the public IP of this host """
-    try:
-        external_ip = urllib.request.urlopen(
-            'https://ident.me').read().decode('utf8')
-    except:
+    """ Return the public IP of this host (looked up once per run) """
+    for url in _IP_URLS:
         try:
-            external_ip = urllib.request.urlopen(
-                'https://ifconfig.me/ip').read().decode('utf8')
+            return urllib.request.urlopen(url, timeout=3).read().decode('utf8')
         except:
-            external_ip = '127.0.0.1'
+            pass
 
-    return external_ip
+    return '127.0.0.1'
 
 
 def get_random_id():
     """ Return a random 10 byte string """
-    letters = string.ascii_letters + string.digits
-    return(''.join(random.choice(letters) for i in range(10)))
\ No newline at end of file
+    return ''.join(random.choices(_ID_CHARS, k=10))
\ No newline at end of file